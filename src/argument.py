@@ -1,9 +1,18 @@
+import os
 import sys
 import textwrap
-from argparse import Action, ArgumentParser, Namespace, RawTextHelpFormatter
-from collections.abc import Sequence
+from argparse import (
+    ArgumentParser,
+    ArgumentTypeError,
+    Namespace,
+    RawTextHelpFormatter,
+    _SubParsersAction,
+)
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import cast, get_args
+from functools import cache
+from shlex import split
+from typing import Any, ClassVar, Final, NoReturn, TypeGuard, get_args
 
 from .default import DEFAULT
 from .name import extract_alphabet
@@ -11,6 +20,37 @@ from .option import Option
 from .seconds import Seconds
 from .spgio import MESSAGE_HANDLER
 
+# When set, deprecated options are still registered to the parser
+ENABLE_DEPRECATED = bool(os.environ.get("SPG_ENABLE_DEPRECATED"))
+
+# Every valid options, for membership test
+OPTIONS: Final[frozenset[str]] = frozenset(get_args(Option))
+
+# Help message of each options, shown at the top-level help
+OPTION_HELP: Final[dict[str, str]] = {
+    "list": "Print information of machines registered in SPG.",
+    "free": "Print free information of available machines.",
+    "job": "print current status of jobs.",
+    "user": "Print job count of users per machine group.",
+    "run": "Run a job.",
+    "runs": "Run several jobs.",
+    "KILL": "Kill jobs satisfying conditions.",
+}
+
+# Message of each deprecated options, redirecting to its counterpart
+DEPRECATED_MESSAGE: Final[dict[str, str]] = {
+    "machine": "'spg machine' is Deprecated. Use 'spg list' instead.",
+    "all": "'spg all' is Deprecated. Use 'spg job -a' instead.",
+    "me": "'spg me' is Deprecated. Use 'spg job' instead.",
+    "kill": "'spg kill' is Deprecated. Use 'spg KILL -m [machine] -p [pid]' instead.",
+    "killall": "'spg killall' is Deprecated. Use 'spg KILL' instead.",
+    "killmachine": (
+        "'spg killmachine' is Deprecated. Use 'spg KILL -m [machine]' instead."
+    ),
+    "killthis": "'spg killthis' is Deprecated. Use 'spg KILL -c [command]' instead.",
+    "killbefore": "'spg killbefore' is Deprecated. Use 'spg KILL -t [time]' instead.",
+}
+
 
 def yes_no(message: str = "") -> bool:
     """
@@ -25,47 +65,78 @@ def yes_no(message: str = "") -> bool:
 
     # Ask 5 times
     for _ in range(5):
-        reply = str(input("(y/n): ")).strip().lower()
-        if reply[0] == "y":
+        reply = input("(y/n): ").strip()
+        if reply[:1] in ("y", "Y"):
             return True
-        elif reply[0] == "n":
+        elif reply[:1] in ("n", "N"):
             return False
         print("You should provied either 'y' or 'n'", end=" ")
     return False
 
 
-class SingleStringAction(Action):
-    """Convert multiple string arguments to single string"""
-
-    def __init__(
-        self,
-        option_strings: Sequence[str],
-        dest: str,
-        nargs: int | str,
-        default: str = "",
-        metavar: str | None = None,
-        required: bool = False,
-        help: str | None = None,
-    ):
-        super().__init__(
-            option_strings,
-            dest,
-            nargs=nargs,
-            default=default,
-            metavar=metavar,
-            required=required,
-            help=help,
-        )
+def parse_limit(limit: str) -> int | None:
+    """Convert limit to integer. 'none' stands for no limit"""
+    if limit.lower() == "none":
+        return None
+    try:
+        return int(limit)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid limit: '{limit}' (integer or 'none')")
+
+
+def is_option(option: str) -> TypeGuard[Option]:
+    """Whether input is a valid option, narrowing its type to Option"""
+    return option in OPTIONS
+
+
+class _LazyHelp:
+    """
+    Help text whose dedent is deferred until argparse actually formats it
+    Most of invocations never print help, so skip the string scanning on those paths
+    """
+
+    __slots__ = ["_text", "_dedented"]
 
-    def __call__(
-        self,
-        parser: ArgumentParser,
-        namespace: Namespace,
-        values: Sequence[str] | None,
-        option_string: str | None,
-    ) -> None:
-        if isinstance(values, Sequence):
-            setattr(namespace, self.dest, " ".join(values))
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._dedented = False
+
+    def __str__(self) -> str:
+        if not self._dedented:
+            self._text = textwrap.dedent(self._text)
+            self._dedented = True
+        return self._text
+
+    def __mod__(self, params: object) -> str:
+        return str(self) % params
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in str(self)
+
+    # Only str methods used by argparse formatter
+    def strip(self, chars: str | None = None) -> str:
+        return str(self).strip(chars)
+
+    def splitlines(self, keepends: bool = False) -> list[str]:
+        return str(self).splitlines(keepends)
+
+
+# Available groups and its help message, shared by every parsers with group option
+GROUP_CHOICES = tuple(DEFAULT.GROUPS)
+GROUP_HELP = _LazyHelp(f"""\
+    List of target machine group names, separated by space.
+    Currently available: {DEFAULT.GROUPS}
+    """)
+
+
+class ShortErrorParser(ArgumentParser):
+    """
+    ArgumentParser reporting only the error message on a parse error
+    Skip formatting the usage, which evaluates every lazy help of the parser
+    """
+
+    def error(self, message: str) -> NoReturn:
+        self.exit(2, f"{self.prog}: error: {message}\n")
 
 
 def add_optional_group(parser: ArgumentParser) -> None:
@@ -74,13 +145,10 @@ def add_optional_group(parser: ArgumentParser) -> None:
         "-g",
         "--group",
         nargs="+",
-        choices=DEFAULT.GROUPS,
+        choices=GROUP_CHOICES,
         default=["tenet", "xenet"],
         metavar="",
-        help=textwrap.dedent(f"""\
-            List of target machine group names, separated by space.
-            Currently available: {DEFAULT.GROUPS}
-            """),
+        help=GROUP_HELP,
     )
     return None
 
@@ -93,7 +161,7 @@ def add_optional_machine(parser: ArgumentParser) -> None:
         nargs="+",
         metavar="",
         default=[],
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             List of target machine names, separated by space.
             ex) tenet1 / tenet1 tenet2
             """),
@@ -127,7 +195,7 @@ def add_optional_pid(parser: ArgumentParser) -> None:
         nargs="*",
         default=[],
         type=int,
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             Jobs with specific PID (Process ID).
             When this option is given, you should specify a single machine name.
             List of pid of target job, separated by space.
@@ -143,8 +211,7 @@ def add_optional_command(parser: ArgumentParser) -> None:
         metavar="",
         nargs="*",
         default="",
-        action=SingleStringAction,
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             Jobs whose commands include pattern.
             List of words to search. The target command should have the exact pattern.
             """),
@@ -159,7 +226,7 @@ def add_optional_time(parser: ArgumentParser) -> None:
         metavar="",
         nargs="*",
         default="",
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             Jobs running less than the given time.
             Time interval separated by space.
             ex) 1w 5d 11h 50m 1s
@@ -175,16 +242,130 @@ def add_optional_start(parser: ArgumentParser) -> None:
         metavar="",
         nargs=1,
         default="",
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             Jobs started at a specific time.
             The start time should exactly match as the result of spg job.
             """),
     )
 
 
-def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
-    # Generate base SPG parser
-    main_parser = ArgumentParser(
+# Deprecated option -> (usage, positional arguments, optional argument adders)
+DEPRECATED_PARSERS: Final[
+    dict[
+        str,
+        tuple[
+            _LazyHelp | str | None,
+            list[tuple[str, dict[str, Any]]],
+            list[Callable[[ArgumentParser], None]],
+        ],
+    ]
+] = {
+    "machine": (None, [], [add_optional_group, add_optional_machine]),
+    "all": (
+        _LazyHelp("""\
+            spg all (-g groups) (-m machines)
+            When group/machine are both given, the group is ignored.
+            When machine is specified, there is no group summary.
+            """),
+        [],
+        [add_optional_group, add_optional_machine],
+    ),
+    "me": (
+        _LazyHelp("""\
+            spg me (-g groups) (-m machines)
+            When group/machine are both given, the group is ignored
+            When machine is specified, there is no group summary
+            """),
+        [],
+        [add_optional_group, add_optional_machine],
+    ),
+    "kill": (
+        "spg kill [machine name] [pid list]",
+        [
+            ("machine", {"help": "target machine name."}),
+            (
+                "pid",
+                {
+                    "nargs": "+",
+                    "type": int,
+                    "help": "List of pid of target job, separated by space.",
+                },
+            ),
+        ],
+        [],
+    ),
+    "killall": (
+        _LazyHelp("""\
+            spg killall (-g groups) (-m machines) (-u user name)
+            When group/machine are both given, the group is ignored.
+            """),
+        [],
+        [add_optional_group, add_optional_machine, add_optional_user],
+    ),
+    "killmachine": (
+        "spg killmachine [machine name]",
+        [("machine", {"help": "target machine name."})],
+        [add_optional_user],
+    ),
+    "killthis": (
+        _LazyHelp("""\
+            spg killthis [pattern] (-g group name) (-m machine name)
+            When group/machine names are both given, group name is ignored.
+            """),
+        [
+            (
+                "command",
+                {
+                    "metavar": "command",
+                    "nargs": "+",
+                    "default": "",
+                    "help": "List of words to search. "
+                    "Target command should have exact pattern.",
+                },
+            )
+        ],
+        [add_optional_group, add_optional_machine],
+    ),
+    "killbefore": (
+        _LazyHelp("""\
+            spg killbefore [time] (-g group name) (-m machine name)
+            When group/machine names are both given, group name is ignored.
+            """),
+        [
+            (
+                "time",
+                {
+                    "nargs": "+",
+                    "help": "Time interval separated by space. " "ex) 1w 5d 11h 50m 1s",
+                },
+            )
+        ],
+        [add_optional_group, add_optional_machine],
+    ),
+}
+
+
+def add_deprecated_parser(option_parser: _SubParsersAction, option: str) -> None:
+    """
+    Register deprecated option, only when SPG_ENABLE_DEPRECATED is set
+    Otherwise, deprecated options are redirected before parsing
+    """
+    usage, positionals, add_optionals = DEPRECATED_PARSERS[option]
+    parser = option_parser.add_parser(
+        name=option,
+        help="Deprecated",
+        formatter_class=RawTextHelpFormatter,
+        usage=usage,
+    )
+    for name, kwargs in positionals:
+        parser.add_argument(name, **kwargs)
+    for add_optional in add_optionals:
+        add_optional(parser)
+
+
+def build_main_parser() -> tuple[ArgumentParser, _SubParsersAction]:
+    """Generate base SPG parser and its sub-parser action, without any option"""
+    main_parser = ShortErrorParser(
         prog="spg",
         formatter_class=RawTextHelpFormatter,
         description="Statistical Physics Group",
@@ -199,22 +380,41 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
 
     # Generate sub-parser
     option_parser = main_parser.add_subparsers(
+        parser_class=ShortErrorParser,
         dest="option",
         title="SPG options",
         required=True,
         metavar="Available Options",
-        description=textwrap.dedent("""\
+        description=_LazyHelp("""\
             Arguments inside square brackets [] are required arguments while parentheses () are optional.
             For more information of each [option], type 'spg [option] -h' or 'spg [option] --help'.
             """),
     )
+    return main_parser, option_parser
+
+
+@cache
+def build_top_level_parser() -> ArgumentParser:
+    """
+    SPG parser whose options have no arguments registered
+    Enough to print top-level help or usage error when no option is given
+    """
+    main_parser, option_parser = build_main_parser()
+    for option, help in OPTION_HELP.items():
+        option_parser.add_parser(name=option, help=help)
+    if ENABLE_DEPRECATED:
+        for option in DEPRECATED_MESSAGE:
+            option_parser.add_parser(name=option, help="Deprecated")
+    return main_parser
+
 
-    ####################################### List Parser #######################################
+def add_list_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'list' and its arguments"""
     parser_list = option_parser.add_parser(
         name="list",
-        help="Print information of machines registered in SPG.",
+        help=OPTION_HELP["list"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
+        usage=_LazyHelp("""\
             spg list (-g groups) (-m machines)
             When group/machine are both given, the group is ignored.
             """),
@@ -222,12 +422,14 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     add_optional_group(parser_list)
     add_optional_machine(parser_list)
 
-    ####################################### Free Parser #######################################
+
+def add_free_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'free' and its arguments"""
     parser_free = option_parser.add_parser(
         name="free",
-        help="Print free information of available machines.",
+        help=OPTION_HELP["free"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
+        usage=_LazyHelp("""\
             spg free (-g groups) (-m machines)
             When group/machine are both given, the group is ignored.
             """),
@@ -235,12 +437,14 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     add_optional_group(parser_free)
     add_optional_machine(parser_free)
 
-    ####################################### Job Parser #######################################
+
+def add_job_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'job' and its arguments"""
     parser_job = option_parser.add_parser(
         name="job",
-        help="print current status of jobs.",
+        help=OPTION_HELP["job"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
+        usage=_LazyHelp("""\
             spg job (-g groups) (-m machines) (-u user) (-a) (-p pid) (-c command) (-t time) (-s start)
             Listed jobs will satisfy all the given options.
             When group/machine are both given, the group is ignored.
@@ -256,12 +460,14 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     add_optional_time(parser_job)
     add_optional_start(parser_job)
 
-    ####################################### User Parser #######################################
+
+def add_user_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'user' and its arguments"""
     parser_user = option_parser.add_parser(
         name="user",
-        help="Print job count of users per machine group.",
+        help=OPTION_HELP["user"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
+        usage=_LazyHelp("""\
             spg user (-g groups) (-m machines)
             When group/machine are both given, the group is ignored.
             """),
@@ -269,12 +475,14 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     add_optional_group(parser_user)
     add_optional_machine(parser_user)
 
-    ####################################### Run Parser #######################################
+
+def add_run_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'run' and its arguments"""
     parser_run = option_parser.add_parser(
         name="run",
-        help="Run a job.",
+        help=OPTION_HELP["run"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
+        usage=_LazyHelp("""\
             spg run [machine] [program] (arguments)
 
             CAUTION!
@@ -288,16 +496,17 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
         "command",
         metavar="command",
         nargs="+",
-        action=SingleStringAction,
         help="command you want to run: [program] (arguments)",
     )
 
-    ####################################### Runs Parser #######################################
+
+def add_runs_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'runs' and its arguments"""
     parser_runs = option_parser.add_parser(
         name="runs",
-        help="Run several jobs.",
+        help=OPTION_HELP["runs"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
+        usage=_LazyHelp("""\
             spg runs [command file] [group] (start end)
 
             CAUTION!
@@ -312,7 +521,7 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     parser_runs.add_argument(
         "group",
         nargs="+",
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             Target machine group name with and optional start, end number.
             When the start and end number is given, only use machines between them.
             ex1) tenet: search every available tenet machines
@@ -327,22 +536,25 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     )
     parser_runs.add_argument(
         "--limit",
-        help=textwrap.dedent("""\
+        help=_LazyHelp("""\
             Limit number of jobs assigned to single machine.
             Assign a small number of (free cores) and (limit)
             This option can be useful when allocating jobs by number of free cores causes memory-overflow problem.
+            'none' or not given: no limit
             """),
-        type=int,
-        default=sys.maxsize,
+        type=parse_limit,
+        default=None,
     )
 
-    ####################################### KILL Parser #######################################
+
+def add_KILL_parser(option_parser: _SubParsersAction) -> None:
+    """Register option 'KILL' and its arguments"""
     parser_KILL = option_parser.add_parser(
         name="KILL",
-        help="Kill jobs satisfying conditions.",
+        help=OPTION_HELP["KILL"],
         formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
-            spg KILL (-g groups) (-m machines) (-u user) (-a) (-p pid) (-c command) (-t time) (-s start)
+        usage=_LazyHelp("""\
+            spg KILL (-g groups) (-m machines) (-u user) (-a) (-p pid) (-c command) (-t time) (-s start) (-y)
             When group/machine are both given, the group is ignored.
 
             CAUTION!!
@@ -359,136 +571,77 @@ def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
     add_optional_command(parser_KILL)
     add_optional_time(parser_KILL)
     add_optional_start(parser_KILL)
+    parser_KILL.add_argument(
+        "-y",
+        "--yes",
+        action="store_true",
+        help="When given, kill jobs without asking. Useful for scripts.",
+    )
 
-    ################################## Deprecated subparsers ##################################
-    def add_positional_machine(parser: ArgumentParser) -> None:
-        """
-        Add positional argument "machine_name" to input parser
-        """
-        parser.add_argument("machine", help="target machine name.")
-        return None
 
-    #################################### Deprecate machine ####################################
-    parser_machine = option_parser.add_parser("machine", help="Deprecated")
-    add_optional_group(parser_machine)
-    add_optional_machine(parser_machine)
+# Option -> function registering the option and its arguments
+OPTION_PARSERS: Final[dict[str, Callable[[_SubParsersAction], None]]] = {
+    "list": add_list_parser,
+    "free": add_free_parser,
+    "job": add_job_parser,
+    "user": add_user_parser,
+    "run": add_run_parser,
+    "runs": add_runs_parser,
+    "KILL": add_KILL_parser,
+}
 
-    ###################################### Deprecate all ######################################
-    parser_all = option_parser.add_parser(
-        name="all",
-        help="Deprecated",
-        formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
-            spg all (-g groups) (-m machines)
-            When group/machine are both given, the group is ignored.
-            When machine is specified, there is no group summary.
-            """),
-    )
-    add_optional_group(parser_all)
-    add_optional_machine(parser_all)
 
-    ###################################### Deprecate me ######################################
-    parser_me = option_parser.add_parser(
-        name="me",
-        help="Deprecated",
-        formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
-            spg me (-g groups) (-m machines)
-            When group/machine are both given, the group is ignored
-            When machine is specified, there is no group summary
-            """),
-    )
-    add_optional_group(parser_me)
-    add_optional_machine(parser_me)
+@cache
+def build_parser(option: str) -> ArgumentParser:
+    """
+    SPG parser with only the given option and its arguments registered
+    Parser does not depend on the rest of user input, so build it once per option
+    """
+    main_parser, option_parser = build_main_parser()
+    if option in DEPRECATED_PARSERS:
+        add_deprecated_parser(option_parser, option)
+    else:
+        OPTION_PARSERS[option](option_parser)
+    return main_parser
 
-    ###################################### Deprecate kill #####################################
-    parser_kill = option_parser.add_parser(
-        name="kill",
-        help="Deprecated",
-        formatter_class=RawTextHelpFormatter,
-        usage="spg kill [machine name] [pid list]",
-    )
-    add_positional_machine(parser_kill)
-    parser_kill.add_argument(
-        "pid",
-        nargs="+",
-        type=int,
-        help="List of pid of target job, separated by space.",
-    )
 
-    #################################### Deprecate killall ####################################
-    parser_killall = option_parser.add_parser(
-        name="killall",
-        help="Deprecated",
-        formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
-            spg killall (-g groups) (-m machines) (-u user name)
-            When group/machine are both given, the group is ignored.
-            """),
-    )
-    add_optional_group(parser_killall)
-    add_optional_machine(parser_killall)
-    add_optional_user(parser_killall)
+def get_arguments(user_input: str | list[str] | None = None) -> Namespace:
+    # Tokenize the user input
+    if user_input is None:
+        argv = sys.argv[1:]
+    elif isinstance(user_input, str):
+        argv = split(user_input)
+    else:
+        argv = user_input
 
-    ################################## Deprecate killmachine ##################################
-    parser_killmachine = option_parser.add_parser(
-        name="killmachine",
-        formatter_class=RawTextHelpFormatter,
-        help="Deprecated",
-        usage="spg killmachine [machine name]",
+    # First word of the input is the option
+    index = next(
+        (idx for idx, token in enumerate(argv) if not token.startswith("-")), len(argv)
     )
-    add_positional_machine(parser_killmachine)
-    add_optional_user(parser_killmachine)
+    option = argv[index] if index < len(argv) else None
 
-    ################################### Deprecate killthis ####################################
-    parser_killthis = option_parser.add_parser(
-        name="killthis",
-        help="Deprecated",
-        formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
-            spg killthis [pattern] (-g group name) (-m machine name)
-            When group/machine names are both given, group name is ignored.
-            """),
-    )
-    parser_killthis.add_argument(
-        "command",
-        metavar="command",
-        nargs="+",
-        action=SingleStringAction,
-        default="",
-        help="List of words to search. Target command should have exact pattern.",
-    )
-    add_optional_group(parser_killthis)
-    add_optional_machine(parser_killthis)
+    # Help before the option: top-level help listing every option
+    if not {"-h", "--help"}.isdisjoint(argv[:index]):
+        option = None
 
-    ################################## Deprecate killbefore ###################################
-    parser_killbefore = option_parser.add_parser(
-        name="killbefore",
-        help="Deprecated",
-        formatter_class=RawTextHelpFormatter,
-        usage=textwrap.dedent("""\
-            spg killbefore [time] (-g group name) (-m machine name)
-            When group/machine names are both given, group name is ignored.
-            """),
-    )
-    parser_killbefore.add_argument(
-        "time", nargs="+", help="Time interval separated by space. ex) 1w 5d 11h 50m 1s"
-    )
-    add_optional_group(parser_killbefore)
-    add_optional_machine(parser_killbefore)
+    # Deprecated options are not registered: redirect them without parsing
+    if option in DEPRECATED_MESSAGE and not ENABLE_DEPRECATED:
+        MESSAGE_HANDLER.error(DEPRECATED_MESSAGE[option])
+        raise SystemExit(2)
 
-    # Parse the arguments
-    if user_input is None:
-        return main_parser.parse_args()
-    elif isinstance(user_input, str):
-        from shlex import split
+    # Only build the parser of given option
+    if option in OPTION_PARSERS or (ENABLE_DEPRECATED and option in DEPRECATED_PARSERS):
+        return build_parser(option).parse_args(argv)
 
-        return main_parser.parse_args(split(user_input))
-    else:
-        return main_parser.parse_args(user_input)
+    # No option or unknown option: only top-level help or usage error is printed
+    main_parser = build_top_level_parser()
+    if not argv:
+        main_parser.print_help()
+        main_parser.exit()
+    return main_parser.parse_args(argv)
 
 
-@dataclass
+@dataclass(slots=True)
 class Argument:
     """Argument dataclass to store user input"""
 
@@ -498,7 +651,7 @@ class Argument:
     group: list[str] = field(default_factory=list)  # Target group
     start_end: tuple[int, int] = (-1, -1)  # Boundary of target group
     all: bool = False  # If true, overwrite user argument to None
-    user: str = DEFAULT.user  # Target user, default: current user
+    user: str = field(default_factory=lambda: DEFAULT.user)  # Default: current user
     pid: list[int] = field(default_factory=list)  # Target pid
     time: Seconds = field(default_factory=Seconds)  # Target time window
     start: str = ""  # Target start time
@@ -508,97 +661,87 @@ class Argument:
 
     # additional options for runs
     force: bool = False  # If true, assign jobs even to busy machine
-    limit: int = sys.maxsize  # Limit the number of jobs assigned to single machine
+    limit: int | None = None  # Limit the number of jobs assigned to single machine
+
+    # additional options for KILL
+    yes: bool = False  # If true, kill jobs without asking
 
     def __post_init__(self) -> None:
-        self.option = self._redirect_option(cast(str, self.option))
-        match self.option:
-            case "list" | "free" | "user":
-                self.all = True
-                self.group = self._overwrite_group(self.machine)
-                self.user = self._check_user(self.all, self.user)
-
-            case "job":
-                self.user = self._check_user(self.all, self.user)
-                self._check_pid(self.pid, self.machine)
-                self.group = self._overwrite_group(self.machine)
-                self.time = self._check_time(cast(list[str], self.time))
-
-            case "run":
-                self.group = [extract_alphabet(self.machine[0])]
-
-            case "runs":
-                self.group, self.start_end = self._check_group_boundary(self.group)
-                self.machine = []
-
-            case "KILL":
-                self.user = self._check_user(self.all, self.user)
-                self._check_permission(self.user)
-                self._check_pid(self.pid, self.machine)
-                self.group = self._overwrite_group(self.machine)
-                self.time = self._check_time(cast(list[str], self.time))
-                self._double_check_KILL()
+        # Interned option hits the dispatch table keys by identity
+        self.option = self._redirect_option(sys.intern(self.option))
+
+        # Words of the command are stored as list by the parser
+        if isinstance(self.command, list):
+            self.command = " ".join(self.command)
+        self._POST_INIT[self.option](self)
 
     @classmethod
     def from_input(cls, user_input: str | list[str] | None = None):
-        return cls(**vars(get_args(user_input)))
+        return cls(**vars(get_arguments(user_input)))
+
+    ############################## Post Initialization per Option ##############################
+    def _post_init_list(self) -> None:
+        """Post initialization of option list, free, user"""
+        self.all = True
+        self.group = self._overwrite_group(self.machine)
+        self.user = ""  # Every users, no need to check
+
+    def _post_init_job(self) -> None:
+        """Post initialization of option job"""
+        self.user = self._check_user(self.all, self.user)
+        self._check_pid(self.pid, self.machine)
+        self.group = self._overwrite_group(self.machine)
+        self.time = self._check_time(self.time)
+
+    def _post_init_run(self) -> None:
+        """Post initialization of option run"""
+        self.group = [extract_alphabet(self.machine[0])]
+
+    def _post_init_runs(self) -> None:
+        """Post initialization of option runs"""
+        self.group, self.start_end = self._check_group_boundary(self.group)
+        self.machine = []
+
+    def _post_init_KILL(self) -> None:
+        """Post initialization of option KILL"""
+        self.user = self._check_user(self.all, self.user)
+        self._check_permission(self.user)
+        self._check_pid(self.pid, self.machine)
+        self.group = self._overwrite_group(self.machine)
+        self.time = self._check_time(self.time)
+        if not self.yes:
+            self._double_check_KILL()
+
+    # Dispatch table of post initialization: option -> handler
+    _POST_INIT: ClassVar[dict[str, Callable[["Argument"], None]]] = {
+        "list": _post_init_list,
+        "free": _post_init_list,
+        "user": _post_init_list,
+        "job": _post_init_job,
+        "run": _post_init_run,
+        "runs": _post_init_runs,
+        "KILL": _post_init_KILL,
+    }
 
     ###################################### Basic Utility ######################################
     def _redirect_option(self, option: str) -> Option:
         """Redirect option to Option class or check deprecated options"""
-        if option in get_args(Option):
+        if is_option(option):
             # When given option is proper, return it's counterpart
-            return cast(Option, option)
-
-        match option:
-            # Redirect to list
-            case "machine":
-                MESSAGE_HANDLER.error(
-                    "'spg machine' is Deprecated. Use 'spg list' instead."
-                )
+            return option
 
-            # Redirect to job
-            case "me":
-                MESSAGE_HANDLER.error("'spg me' is Deprecated. Use 'spg job' instead.")
-            case "all":
-                MESSAGE_HANDLER.error(
-                    "'spg all' is Deprecated. Use 'spg job -a' instead."
-                )
-
-            # Redirect to KILL
-            case "kill":
-                MESSAGE_HANDLER.error(
-                    "'spg kill' is Deprecated. "
-                    "Use 'spg KILL -m [machine] -p [pid]' instead."
-                )
-            case "killall":
-                MESSAGE_HANDLER.error(
-                    "'spg killall' is Deprecated. Use 'spg KILL' instead."
-                )
-            case "killmachine":
-                MESSAGE_HANDLER.error(
-                    "'spg killmachine' is Deprecated. Use 'spg KILL -m [machine]'"
-                    " instead."
-                )
-            case "killthis":
-                MESSAGE_HANDLER.error(
-                    "'spg killthis' is Deprecated. Use 'spg KILL -c [command]' instead."
-                )
-            case "killbefore":
-                MESSAGE_HANDLER.error(
-                    "'spg killbefore' is Deprecated. Use 'spg KILL -t [time]' instead."
-                )
-        exit()
+        message = DEPRECATED_MESSAGE.get(option)
+        if message is not None:
+            MESSAGE_HANDLER.error(message)
+        raise SystemExit(2)
 
     def _overwrite_group(self, machines: list[str]) -> list[str]:
         """Overwrite group option by machine option if it exists"""
-        if len(machines) == 0:
+        if not machines:
             return self.group
 
         # Group from machine
-        return list(
-            dict.fromkeys(extract_alphabet(machine_name) for machine_name in machines)
-        )
+        return list(dict.fromkeys(map(extract_alphabet, machines)))
 
     def _check_user(self, all_user: bool, user: str) -> str:
         """Check if input user is registered."""
@@ -606,41 +749,50 @@ class Argument:
             return ""
 
         # Check if input user name is valid
-        if user in DEFAULT.USERS:
+        if user in DEFAULT.USER_SET:
             return user
 
         MESSAGE_HANDLER.error(f"Invalid user name: {self.user}.")
-        exit()
+        raise SystemExit(2)
 
     def _check_pid(self, pids: list[int], machines: list[str]) -> None:
         """When pid list is given, you should specify machine name"""
-        if len(pids) == 0:
+        if not pids:
             return
 
         if len(machines) != 1:
             MESSAGE_HANDLER.error(
                 "When killing job with pid, you should specify single machine name."
             )
-            exit()
+            raise SystemExit(2)
 
     def _check_group_boundary(
         self, group: list[str]
     ) -> tuple[list[str], tuple[int, int]]:
         """Check args for option 'runs'"""
-        match group:
-            case [group_name]:
-                return [group_name], (-1, -1)
-            case [group_name, start, end]:
-                return [group_name], (int(start), int(end))
-            case _:
+        if len(group) == 1:
+            return group, (-1, -1)
+
+        if len(group) == 3:
+            try:
+                return group[:1], (int(group[1]), int(group[2]))
+            except ValueError:
                 MESSAGE_HANDLER.error(
-                    "When using 'runs' option, "
-                    "you should specifiy machine group and optional start/end number."
+                    f"Invalid start/end number: {group[1]} {group[2]}"
                 )
-                exit()
+                raise SystemExit(2)
+
+        MESSAGE_HANDLER.error(
+            "When using 'runs' option, "
+            "you should specifiy machine group and optional start/end number."
+        )
+        raise SystemExit(2)
 
-    def _check_time(self, time: list[str]) -> Seconds:
-        if len(time) == 0:
+    def _check_time(self, time: list[str] | Seconds) -> Seconds:
+        """Convert time window given by parser. Already converted one is kept"""
+        if isinstance(time, Seconds):
+            return time
+        if not time:
             return Seconds()
 
         try:
@@ -648,7 +800,7 @@ class Argument:
         except (KeyError, ValueError):
             MESSAGE_HANDLER.error(f"Invalid time window: {' '.join(time)}")
             MESSAGE_HANDLER.error("Run 'spg KILL -h' for more help")
-            exit()
+            raise SystemExit(2)
 
     def _check_permission(self, user: str | None) -> None:
         """Check argument user for option 'KILL'"""
@@ -656,47 +808,48 @@ class Argument:
         # When killing other user, you should be root
         if (user != DEFAULT.user) and (DEFAULT.user != "root"):
             MESSAGE_HANDLER.error("When killing other user's job, you should be root.")
-            exit()
+            raise SystemExit(2)
 
     def _double_check_KILL(self) -> None:
         """Double check if you really want to kill job"""
-        question = "Do you want to kill "
+        question = ["Do you want to kill "]
 
         # When user is specified
         if self.user == DEFAULT.user:
-            question += "your jobs"
+            question.append("your jobs")
         elif self.user == "":
-            question += "jobs of all users"
+            question.append("jobs of all users")
         else:
-            question += f"jobs of user {self.user}"
+            question.append(f"jobs of user {self.user}")
 
         # Kill by PID
         if self.pid:
-            question += f" with pid {self.pid}"
+            question.append(f" with pid {self.pid}")
 
         # Kill by machine
         if self.machine:
-            question += f" at machine {self.machine}"
+            question.append(f" at machine {self.machine}")
         # Kill by group
         elif self.group:
-            question += f" at group {self.group}"
+            question.append(f" at group {self.group}")
         # Kill without restriction
         else:
-            question += " at all machines"
+            question.append(" at all machines")
 
         # Kill condition of command
         if self.command:
-            question += f" with command including '{self.command}'"
+            question.append(f" with command including '{self.command}'")
 
         # Kill condition of time
         if self.time != Seconds():
-            question += f" with running less than '{self.time:human}'"
+            question.append(f" with running less than '{self.time:human}'")
 
         # Kill condition of start
         if self.start:
-            question += f" starts at time '{self.start}'"
+            question.append(f" starts at time '{self.start}'")
 
         # Get user input
-        if not yes_no(question + "?"):
+        question.append("?")
+        if not yes_no("".join(question)):
             MESSAGE_HANDLER.success("\nAborting...")
-            exit()
+            raise SystemExit(1)
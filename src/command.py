@@ -1,21 +1,32 @@
+from collections.abc import Iterable
+from functools import cache
 from pathlib import Path
+from shlex import quote
 
 from .default import DEFAULT
 
 
 ####################################### ssh command #######################################
-def ssh_to_machine(machine_name: str) -> str:
-    """SSH to input machine"""
+def ssh_to_machine(machine_name: str) -> tuple[str, ...]:
+    """
+    SSH to input machine, already tokenized
+    Command to run at the machine is appended as a single token, without shlex
+    """
     return (
-        "ssh -T "  # Disable pseudo-tty allocation: Do not need terminal
-        "-o StrictHostKeyChecking=no "  # SSH without checking host key(fingerprint) at known_hosts
-        "-o ConnectTimeout=4 "  # Timeout in seconds for connecting ssh
-        "-o UpdateHostKeys=no "  # Do not update know_hosts if it already exists
-        f"{machine_name}"  # Target machine to ssh
+        "ssh",
+        "-T",  # Disable pseudo-tty allocation: Do not need terminal
+        "-o",
+        "StrictHostKeyChecking=no",  # SSH without checking host key(fingerprint) at known_hosts
+        "-o",
+        "ConnectTimeout=4",  # Timeout in seconds for connecting ssh
+        "-o",
+        "UpdateHostKeys=no",  # Do not update know_hosts if it already exists
+        machine_name,  # Target machine to ssh
     )
 
 
 ################################ ps & free memory commands ################################
+@cache
 def ps_from_user(user_name: str) -> str:
     """
     ps command to find job information w.r.t input user
@@ -42,43 +53,48 @@ def ps_from_user(user_name: str) -> str:
     )
 
 
-def ps_from_pid(pid: int) -> str:
-    """Same as ps_from_user but specified by pid"""
+def ps_from_pids(pids: Iterable[int]) -> str:
+    """Same as ps_from_user but specified by pids, queried at once"""
     return (
         "ps H "  # Show threads as if they were processes
         "--no-headers "  # Do not print header
-        f"-q {pid} "  # Only select job with input pid
+        f"-q {','.join(map(str, pids))} "  # Only select jobs with input pids
         "--format ruser:15,stat,pid,sid,pcpu,pmem,rss:10,time:15,start_time,args"
     )
 
 
-def pid_to_ppid(pid: int) -> str:
-    """ps command to find ppid(parent pid) of input process"""
+def all_ppids() -> str:
+    """ps command to find ppid(parent pid) of every processes, as a single snapshot"""
     return (
-        "ps --no-headers "  # Do not print header
-        f"-q {pid} "  # Search by pid
-        "--format ppid"  # Only return paraent pid
+        "ps -e "  # Select every processes
+        "--no-headers "  # Do not print header
+        "--format pid,ppid"  # Return pid and its paraent pid
     )
 
 
 def free_ram() -> str:
-    """free command to get free ram"""
+    """
+    awk command to get free ram from /proc/meminfo, which is what free reads
+    Single process instead of piping free, grep and awk
+    """
     return (
-        "free --bytes "  # Show memory in unit of byte
-        "| grep Mem "  # Grep only a line of memory values
-        "| awk '{print $NF}'"  # return last value: available memory in bytes
+        "awk '/^MemAvailable:/ "  # Only a line of available memory
+        "{print $2}' "  # Available memory in unit of KiB
+        "/proc/meminfo"
     )
 
 
 ################################### nvidia-smi commands ###################################
 def ns_process() -> str:
-    """nvidia-smi command to get process running at gpu"""
+    """
+    nvidia-smi command to get process running at gpu
+    Column names start with '#' and are skipped by the caller, not by tail
+    """
     return (
         "nvidia-smi pmon "  # nvidia-smi process monitor mode
         "--count 1 "  # Only sample single result
         "--select um "  # Monitor both utilization and memory usage
-        "--delay 10 "  # Collect within 10 seconds interval
-        "| tail -n +3"  # Omit first two lines: column names
+        "--delay 1"  # Collect within 1 second interval: pmon waits for it
     )
 
 
@@ -92,10 +108,16 @@ def free_vram() -> str:
 
 
 ################################### run & kill commands ###################################
+@cache
+def _cwd() -> str:
+    """Directory where spg is invoked, quoted for the remote shell: jobs are run here"""
+    return quote(str(Path.cwd()))
+
+
 def run_at_cwd(command: str) -> str:
     """Run input command at current path"""
     return (
-        f"cd {Path.cwd()}; "  # Change pwd to current directory
+        f"cd {_cwd()}; "  # Change pwd to current directory
         f"{command}"  # run command
     )
 
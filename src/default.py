@@ -1,7 +1,7 @@
 import json
 import os
-import pwd
-from functools import cache
+import sys
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -17,20 +17,23 @@ class Default:
         with open(SPG_DIR / "config.json", "r") as file:
             config: dict[str, Any] = json.load(file)
 
-        self.USERS: list[str] = config["users"]
-        self.GROUPS: list[str] = config["groups"]
+        # Interned: used as dictionary keys and compared against interned names
+        self.USERS: list[str] = list(map(sys.intern, config["users"]))
+        self.USER_SET: frozenset[str] = frozenset(self.USERS)  # For membership test
+        self.GROUPS: list[str] = list(map(sys.intern, config["groups"]))
         self.MAX_RUNS: int = config["max_runs"]
         self.WIDTH: int = config["width"]
 
-    @property
-    @cache
+    @cached_property
     def user(self) -> str:
         """
         Return user's name if user is registered in SPG
         Otherwise, save error message to handler and exit program
         """
+        import pwd
+
         user = pwd.getpwuid(os.geteuid()).pw_name
-        if user in self.USERS:
+        if user in self.USER_SET:
             return user
 
         from .spgio import MESSAGE_HANDLER
@@ -39,10 +42,9 @@ class Default:
             f"ERROR: User '{user}' is not registerd in SPG\n"
             "Please contact to server administrator"
         )
-        exit()
+        raise SystemExit(1)
 
-    @property
-    @cache
+    @cached_property
     def group_files(self) -> dict[str, Path]:
         """Return dictionary of machine group file paths for each groups"""
         return {group: SPG_DIR / f"machine/{group}.json" for group in self.GROUPS}
@@ -29,6 +29,18 @@ class Group:
         # Read machine informations from group file
         self.machines = self.load_file(group_file)  # Dictionary of name: machine
 
+        # Summary of machines, updated by _summarize
+        self.num_machine: int = 0  # Number of machines
+        self.num_cpu: int = 0  # Number of cpu cores
+        self.num_gpu: int = 0  # Number of gpus
+        self.busy_machines: list[Machine] = []  # Machines with running jobs
+        self.free_machines: list[Machine] = []  # Machines with available units
+        self.num_job: int = 0  # Number of running jobs
+        self.num_free_cpu: int = 0  # Number of free cpu cores at free machines
+        self.num_free_gpu: int = 0  # Number of free gpus
+        self.num_free_machine: int = 0  # Number of free machines
+        self._summarize()
+
     def load_file(self, group_file: Path) -> dict[str, Machine]:
         """Read group file and store machine information to machines"""
         machines: dict[str, Machine] = {}
@@ -68,62 +80,36 @@ class Group:
                 for name, machine in self.machines.items()
                 if start_end[0] <= get_machine_index(name) <= start_end[1]
             }
+        self._summarize()
         return self
 
-    ####################### Basic informations, regardless of scanning #######################
-    @property
-    def num_machine(self) -> int:
-        """Number of machines in the group"""
-        return len(self.machines)
-
-    @property
-    def num_cpu(self) -> int:
-        """Number of cpu cores in the group"""
-        return sum(machine.num_cpu for machine in self.machines.values())
-
-    @property
-    def num_gpu(self) -> int:
-        """Number of gpu in the group"""
-        return sum(
-            machine.num_gpu
-            for machine in self.machines.values()
-            if isinstance(machine, GPUMachine)
-        )
-
-    ##################### Busy, free informations, valid after scanning #####################
-    @property
-    def busy_machines(self) -> list[Machine]:
-        """List of busy machines, which has more than one job"""
-        return [machine for machine in self.machines.values() if machine.num_job]
-
-    @property
-    def num_job(self) -> int:
-        """Number of running jobs inside group"""
-        return sum(machine.num_job for machine in self.busy_machines)
-
-    @property
-    def free_machines(self) -> list[Machine]:
-        """List of machines with at least one free core"""
-        return [machine for machine in self.machines.values() if machine.num_available]
-
-    @property
-    def num_free_machine(self) -> int:
-        """Number of free machines, which has more than one free core (either cpu or gpu)"""
-        return len(self.free_machines)
-
-    @property
-    def num_free_cpu(self) -> int:
-        """Number of free cpu cores in the group"""
-        return sum(machine.num_free_cpu for machine in self.free_machines)
-
-    @property
-    def num_free_gpu(self) -> int:
-        """Number of free gpu cores in the group"""
-        return sum(
-            machine.num_free_gpu
-            for machine in self.free_machines
-            if isinstance(machine, GPUMachine)
-        )
+    ######################################## Summary ########################################
+    def _summarize(self) -> None:
+        """
+        Store summary of machines, instead of recomputing it at every access
+        Updated whenever machines are changed or scanned
+        """
+        # Basic informations, regardless of scanning
+        self.num_machine = len(self.machines)
+        self.num_cpu, self.num_gpu = 0, 0
+
+        # Busy, free informations, valid after scanning
+        self.busy_machines, self.free_machines = [], []
+        self.num_job, self.num_free_cpu, self.num_free_gpu = 0, 0, 0
+
+        # Single pass over machines
+        for machine in self.machines.values():
+            self.num_cpu += machine.num_cpu
+            if num_job := machine.num_job:
+                self.busy_machines.append(machine)
+                self.num_job += num_job
+            if machine.num_available:
+                self.free_machines.append(machine)
+                self.num_free_cpu += machine.num_free_cpu
+            if isinstance(machine, GPUMachine):
+                self.num_gpu += machine.num_gpu
+                self.num_free_gpu += machine.num_free_gpu
+        self.num_free_machine = len(self.free_machines)
 
     ############################# Line Format Information for Print #############################
     def __format__(self, format_spec: str) -> str:
@@ -200,18 +186,28 @@ class Group:
 
         # Multi-threaded scanning: maximum worker w.r.t Windows (61)
         with cf.ThreadPoolExecutor(max_workers=61) as executor:
-            executor.map(scan_machine, self.machines.values())
+            futures = [
+                executor.submit(scan_machine, machine)
+                for machine in self.machines.values()
+            ]
+            # In order of completion, raising error of any machine
+            for future in cf.as_completed(futures):
+                future.result()
+        self._summarize()
 
     ##################################### Run Jobs #####################################
     def runs(
-        self, commands: deque[str], max_calls: int, single_machine_limit: int
+        self,
+        commands: deque[str],
+        max_calls: int,
+        single_machine_limit: int | None = None,
     ) -> deque[str]:
         """
         Run jobs in commands
         Args
             commands: commands to be run
             max_calls: maximum number of jobs that group can run in a single execution
-            single_machine_limit: Maximum number of jobs that a machine can run
+            single_machine_limit: Maximum number of jobs that a machine can run, None for no limit
         Return
             Remaining commands after run
         """
@@ -220,7 +216,10 @@ class Group:
         # Run commands on free machines
         with cf.ThreadPoolExecutor(max_workers=50) as executor:
             for machine in self.free_machines:
-                for _ in range(min(machine.num_available, single_machine_limit)):
+                num_job = machine.num_available
+                if single_machine_limit is not None:
+                    num_job = min(num_job, single_machine_limit)
+                for _ in range(num_job):
                     executor.submit(machine.run, commands.popleft().strip())
                     num_executed += 1
 
@@ -232,14 +231,17 @@ class Group:
         return commands
 
     def force_runs(
-        self, commands: deque[str], max_calls: int, single_machine_limit: int
+        self,
+        commands: deque[str],
+        max_calls: int,
+        single_machine_limit: int | None = None,
     ) -> deque[str]:
         """
         Forece run jobs in commands: Run job not only in free machine, but also in busy machines
         Args
             commands: commands to be run
             max_calls: maximum number of jobs that group can run in a single execution
-            single_machine_limit: Maximum number of jobs that a machine can run
+            single_machine_limit: Maximum number of jobs that a machine can run, None for no limit
         Return
             Remaining commands after run
         """
@@ -248,7 +250,10 @@ class Group:
         # Run commands on every machines
         with cf.ThreadPoolExecutor(max_workers=50) as executor:
             for machine in self.machines.values():
-                for _ in range(min(machine.num_core, single_machine_limit)):
+                num_job = machine.num_core
+                if single_machine_limit is not None:
+                    num_job = min(num_job, single_machine_limit)
+                for _ in range(num_job):
                     executor.submit(machine.run, commands.popleft().strip())
                     num_executed += 1
 
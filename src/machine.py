@@ -1,7 +1,6 @@
 import subprocess
 from collections import Counter, abc
 from functools import cache
-from shlex import split
 
 from . import command as Command
 from .default import DEFAULT
@@ -19,6 +18,7 @@ class Machine:
         "comment",
         "jobs",
         "pid_tree",
+        "ppids",
         "error",
     ]
 
@@ -36,6 +36,7 @@ class Machine:
         self.error: bool = False  # If error occurs during scanning, set True
         self.jobs: list[Job] = []  # List of running jobs
         self.pid_tree: dict[int, set[int]] = {}  # pid of running jobs with parents
+        self.ppids: dict[int, int] = {}  # ppid of every processes at machine
 
     ####################### Basic informations, regardless of scanning #######################
     @property
@@ -52,8 +53,8 @@ class Machine:
 
     @property
     @cache
-    def command_ssh(self) -> str:
-        """Command to ssh to machine"""
+    def command_ssh(self) -> tuple[str, ...]:
+        """Tokenized command to ssh to machine"""
         return Command.ssh_to_machine(self.name)
 
     ##################### Busy, free informations, valid after scanning #####################
@@ -78,9 +79,9 @@ class Machine:
     def free_ram(self) -> Ram:
         """Absolute value of free RAM"""
         free_ram = subprocess.check_output(
-            split(f'{self.command_ssh} "{Command.free_ram()}"'), text=True
-        )  # free ram in unit of "Byte"
-        return Ram.from_string(f"{free_ram.strip()}B")
+            [*self.command_ssh, Command.free_ram()], text=True
+        )  # free ram in unit of "KiB"
+        return Ram.from_string(f"{free_ram.strip()}KiB")
 
     ######################### kill informations, valid after killing #########################
     @property
@@ -139,19 +140,42 @@ class Machine:
         else:
             self.pid_tree[depth] = {pid}
 
-    def _track_pid_tree(self, pid: int, sid: int) -> None:
-        """Track pid tree from leaf(pid) to root(sid)"""
-        depth = 0
-        self._stack_pid_tree(depth, pid)
-        while pid != sid:
-            # Find ppid(parent pid) of input pid
-            ppid = subprocess.check_output(
-                split(f"{self.command_ssh} '{Command.pid_to_ppid(pid)}'"), text=True
-            ).strip()
-
-            # Increase depth and update pid to it's ppid
-            depth, pid = depth + 1, int(ppid)
+    def _load_ppids(self) -> None:
+        """
+        Store ppid(parent pid) of every processes at machine with a single ssh
+        Processes finished in the meantime are not reported by ps and skipped
+        When error occurs during SSH, raise RuntimeError
+        """
+        for line in self._get_process_infos(Command.all_ppids()):
+            pid, ppid = map(int, line.split())
+            self.ppids[pid] = ppid
+
+    def _track_pid_tree(self, jobs: list[Job]) -> None:
+        """
+        Track pid tree of jobs from leaf(pid) to root(sid)
+        Stop before a parent which is init(1)/kernel(0) or gone from the snapshot
+        """
+        if not jobs:
+            return
+
+        try:
+            self._load_ppids()
+        except RuntimeError:
+            # Error is already reported. Do not kill jobs without their parents
+            self.error = True
+            self.jobs.clear()
+            return
+
+        for job in jobs:
+            depth, pid = 0, job.pid
             self._stack_pid_tree(depth, pid)
+            while pid != job.sid:
+                ppid = self.ppids.get(pid, 0)
+                if ppid <= 1 or ppid not in self.ppids:
+                    break
+                # Increase depth and update pid to it's ppid
+                depth, pid = depth + 1, ppid
+                self._stack_pid_tree(depth, pid)
 
     ########################### Get Information of Machine Instance ###########################
     def _get_process_infos(self, command_process: str) -> list[str]:
@@ -163,7 +187,7 @@ class Machine:
                              This could be either 'ps' or 'nvidia-smi'
         """
         result = subprocess.run(
-            split(f"{self.command_ssh} '{command_process}'"),
+            [*self.command_ssh, command_process],
             capture_output=True,
             text=True,
         )
@@ -207,8 +231,9 @@ class Machine:
 
             # Store scanned information
             self.jobs.append(job)
-            if include_parents:
-                self._track_pid_tree(job.pid, job.sid)
+
+        if include_parents:
+            self._track_pid_tree(self.jobs)
 
     def get_user_count(self) -> Counter[str]:
         """Return the Counter of {user name: number of jobs}"""
@@ -218,7 +243,7 @@ class Machine:
     def run(self, command: str) -> None:
         """run input command at current directory"""
         # Run command on background, not waiting to finish
-        subprocess.Popen(split(f"{self.command_ssh} '{Command.run_at_cwd(command)}'"))
+        subprocess.Popen([*self.command_ssh, Command.run_at_cwd(command)])
 
         # Print the result and save to logger
         MESSAGE_HANDLER.success(f"SUCCESS {self.name:<10}: run '{command}'")
@@ -239,7 +264,7 @@ class Machine:
 
         # Run kill command inside ssh target machine
         kill_result = subprocess.run(
-            split(f"{self.command_ssh} '{command_kill}'"),
+            [*self.command_ssh, command_kill],
             capture_output=True,
             text=True,
         )
@@ -315,9 +340,7 @@ class GPUMachine(Machine):
 
         # Otherwise, get list of free vram
         free_vrams = (
-            subprocess.check_output(
-                split(f"{self.command_ssh} '{Command.free_vram()}'"), text=True
-            )
+            subprocess.check_output([*self.command_ssh, Command.free_vram()], text=True)
             .strip()
             .split("\n")
         )
@@ -340,15 +363,30 @@ class GPUMachine(Machine):
         return machine_info
 
     ########################### Get Information of Machine Instance ###########################
-    def _get_ps_infos_from_pid(self, pid: int) -> list[str]:
-        """Find ps info of job having input pid"""
-        return (
-            subprocess.check_output(
-                split(f"{self.command_ssh} '{Command.ps_from_pid(pid)}'"), text=True
-            )
-            .strip()
-            .split("\n")
+    def _get_ps_infos_from_pids(self, pids: list[int]) -> dict[int, list[str]]:
+        """
+        Find ps infos of jobs having input pids with a single ssh, grouped by pid
+        When error occurs during SSH, raise RuntimeError
+        """
+        ps_infos: dict[int, list[str]] = {pid: [] for pid in pids}
+        if not pids:
+            return ps_infos
+
+        result = subprocess.run(
+            [*self.command_ssh, Command.ps_from_pids(pids)],
+            capture_output=True,
+            text=True,
         )
+        # Check scan error: ps returns 1 without stderr when no process is found
+        if result.stderr or result.returncode not in (0, 1):
+            error = result.stderr.strip() or f"exit status {result.returncode}"
+            MESSAGE_HANDLER.error(f"ERROR from {self.name}: {error}")
+            raise RuntimeError
+
+        for ps_info in result.stdout.splitlines():
+            pid = int(ps_info.split()[2])  # ruser, stat, pid, ...
+            ps_infos[pid].append(ps_info)
+        return ps_infos
 
     def scan(
         self,
@@ -376,12 +414,15 @@ class GPUMachine(Machine):
 
         # Get list of raw process: Use nvidia-smi
         try:
-            ns_infos = self._get_process_infos(Command.ns_process())
+            infos = self._get_process_infos(Command.ns_process())
         except RuntimeError:
             # When error occurs, Do nothing and return since error is already reported
             self.error = True
             return
+        ns_infos = [info for info in infos if not info.startswith("#")]
 
+        # Processes running at gpus: gpu index, pid, ns_info
+        gpu_processes: list[tuple[int, int, list[str]]] = []
         for ns_info in ns_infos:
             ns_info = ns_info.strip().split()
 
@@ -393,14 +434,25 @@ class GPUMachine(Machine):
             if pid == -1:
                 self.free_gpus.add(gpu_idx)
                 continue
+            gpu_processes.append((gpu_idx, pid, ns_info))
 
+        # Multiple ps info per pid, for every pids at once
+        try:
+            ps_infos_by_pid = self._get_ps_infos_from_pids(
+                list(dict.fromkeys(pid for _, pid, _ in gpu_processes))
+            )
+        except RuntimeError:
+            # When error occurs, Do nothing and return since error is already reported
+            self.error = True
+            return
+
+        for gpu_idx, pid, ns_info in gpu_processes:
             # Retrieve process informations from ns_info
             gpu_percent = float(ns_info[3].replace("-", "0"))  # For redundancy
             vram_use = Ram.from_string(f"{ns_info[9].replace("-", "0")}MB")
             vram_percent = vram_use / self.vram * 100.0
-            ps_infos = self._get_ps_infos_from_pid(pid)  # Multiple ps info per pid
 
-            for ps_info in filter_by_user(ps_infos):
+            for ps_info in filter_by_user(ps_infos_by_pid[pid]):
                 job = GPUJob.from_info(
                     machine_name=f"{self.name}-GPU{gpu_idx}",
                     ps_info=ps_info,
@@ -414,10 +466,11 @@ class GPUMachine(Machine):
 
                 # Store scanned information
                 self.jobs.append(job)
-                if include_parents:
-                    self._track_pid_tree(job.pid, job.sid)
                 break  # One job per pid of single gpu
 
+        if include_parents:
+            self._track_pid_tree(self.jobs)
+
 
 if __name__ == "__main__":
     print("This is moudle Machine from SPG")
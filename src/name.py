@@ -1,4 +1,6 @@
 import string
+import sys
+from functools import cache
 
 
 def extract_number(target: str) -> str:
@@ -7,8 +9,14 @@ def extract_number(target: str) -> str:
     )
 
 
+@cache
 def extract_alphabet(target: str) -> str:
-    return "".join(char for char in target if char in string.ascii_letters)
+    """
+    Get alphabets of target. Pure function of small strings, so memoized
+    Result is interned since it is mostly used as a key of group dictionaries
+    e.g., tenet100 -> tenet
+    """
+    return sys.intern("".join(char for char in target if char in string.ascii_letters))
 
 
 def get_machine_index(machine_name: str) -> int:
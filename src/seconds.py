@@ -20,27 +20,24 @@ class Seconds:
     @classmethod
     def from_input(cls, input_times: list[str]) -> Seconds:
         """1w 2d 3h 40m 56s to Seconds"""
-        return sum(
-            [
-                cls(int(input_time[:-1]), TimeUnit[input_time[-1]])
+        return cls(
+            sum(
+                int(input_time[:-1]) * TimeUnit[input_time[-1]].value
                 for input_time in input_times
-            ],
-            start=cls(),
+            )
         )
 
     @classmethod
     def from_ps(cls, ps_times: str) -> Seconds:
         """ps time format [DD-]HH:MM:SS to Seconds"""
-        seconds = sum(
-            [
-                cls(int(ps_time), unit)
+        return cls(
+            sum(
+                int(ps_time) * unit.value
                 for ps_time, unit in zip(
                     reversed(ps_times.replace("-", ":").split(":")), TimeUnit
                 )
-            ],
-            start=cls(),
+            )
         )
-        return seconds
 
     @property
     def second(self) -> int:
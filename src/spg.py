@@ -110,11 +110,16 @@ class SPG:
             self.printer.register_progress_bar(group_name, set(group.machines))
 
         # Scan job for every groups in group list
-        with cf.ThreadPoolExecutor(max_workers=len(self.groups)) as executor:
-            executor.map(scan_group, self.groups.values())
-
-        # Close progressbar
-        self.printer.close_progress_bars()
+        try:
+            with cf.ThreadPoolExecutor(max_workers=len(self.groups)) as executor:
+                futures = [
+                    executor.submit(scan_group, group) for group in self.groups.values()
+                ]
+                for future in cf.as_completed(futures):
+                    future.result()
+        finally:
+            # Close progressbar, even when error is raised during scanning
+            self.printer.close_progress_bars()
 
     ####################################### SPG command #######################################
     def list(self) -> None:
@@ -8,7 +8,6 @@ from pathlib import Path
 from typing import Callable
 
 import colorama
-from tqdm import tqdm
 
 from .default import DEFAULT, SPG_DIR
 from .name import extract_alphabet
@@ -23,6 +22,10 @@ class ProgressBar:
     def __init__(self, pool: set[str], bar_width: int) -> None:
         self.pool = pool
         self.name = extract_alphabet(next(iter(pool)))
+
+        # tqdm is heavy to import and only needed when progress bar is shown
+        from tqdm import tqdm
+
         self.bar = tqdm(
             total=len(self.pool),
             bar_format="{desc}{bar}|{percentage:3.1f}%|",
@@ -71,7 +74,12 @@ class Printer:
         silent: If true, do not print process bar
         groups: Only used when option is Option.user
         """
-        self.print_fn: Callable[[str], None] = print if silent else tqdm.write
+        if silent:
+            self.print_fn: Callable[[str], None] = print
+        else:
+            from tqdm import tqdm
+
+            self.print_fn = tqdm.write
 
         # Progress bar
         self.silent = silent  # If true, skip progress bar